@@ -1,8 +1,129 @@
 import os
 import argparse
-import json
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
+from matplotlib import font_manager
+
+# Prefer the faster orjson/ujson parsers when available
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    try:
+        from ujson import loads as json_loads
+    except ImportError:
+        from json import loads as json_loads
+
+# Number of cycle tracker entries drawn individually before the rest are bucketed
+TOP_K = 30
+
+# Resolution of the rendered PNG charts
+DPI = 150
+
+# Favour fast PNG encoding over file size
+PNG_KWARGS = {"compress_level": 1, "optimize": False}
+
+# Summary lines shown below each chart, included when the key is present in the report
+SUMMARY_SCHEMA = [
+    ("total_blobs", "Total Blobs in Namespace: {:,}"),
+    ("total_blockexec_inputs", "Total EVM block executions: {:,}"),
+    ("total_tx_count", "Total EVM Txs: {:,}"),
+    ("total_evm_gas", "Total EVM Gas: {:,}"),
+    ("total_proofs", "Total Proofs: {:,}"),
+    ("total_gas", "Total Gas: {:,}"),
+    ("total_instruction_count", "Total Instructions: {:,}"),
+    ("total_syscall_count", "Total Syscalls: {:,}"),
+]
+
+# Font properties shared by every chart title and axis label
+TITLE_FP = font_manager.FontProperties(size=12)
+LABEL_FP = font_manager.FontProperties(size=10)
+
+# Summary text style, also used to size the space reserved for it below the chart
+SUMMARY_FONTSIZE = 11
+SUMMARY_LINESPACING = 1.5
+
+# Padding in inches above and below the summary text
+SUMMARY_PAD = 0.15
+
+# Figure reused across every chart rendered by this process
+_fig = None
+
+def get_figure():
+    global _fig
+    if _fig is None:
+        _fig = plt.figure(figsize=(12, 7), constrained_layout=True)
+    else:
+        _fig.clear()
+    return _fig
+
+def worker_init():
+    # Resolve fonts and allocate the shared figure before any chart is rendered
+    get_figure()
+    font_manager.findfont(TITLE_FP)
+    font_manager.findfont(font_manager.FontProperties(family='monospace'))
+
+def process_file(file_path, save_path, top_k=TOP_K, dpi=DPI, pdf=False):
+    print(f"Processing: {file_path} → {save_path}")
+
+    with open(file_path, "rb") as f:
+        data = json_loads(f.read())
+
+    cycle_data = data["cycle_tracker_results"]
+    if top_k > 0:
+        sorted_items = heapq.nlargest(top_k, cycle_data.items(), key=lambda x: x[1])
+        tail_count = len(cycle_data) - len(sorted_items)
+        if tail_count:
+            tail_sum = sum(cycle_data.values()) - sum(v for _, v in sorted_items)
+            sorted_items.append((f"other ({tail_count} entries)", tail_sum))
+    else:
+        sorted_items = sorted(cycle_data.items(), key=lambda x: x[1], reverse=True)
+    labels = [label for label, _ in sorted_items]
+    values = [count for _, count in sorted_items]
+
+    summary_lines = [fmt.format(data[key]) for key, fmt in SUMMARY_SCHEMA if key in data]
+    summary_text = "\n".join(summary_lines)
+
+    file_name = os.path.basename(file_path)
+
+    fig = get_figure()
+
+    # Reserve enough space below the chart for every summary line
+    fig_height = fig.get_figheight()
+    summary_height = len(summary_lines) * SUMMARY_FONTSIZE * SUMMARY_LINESPACING / 72
+    bottom = (summary_height + 2 * SUMMARY_PAD) / fig_height
+    fig.get_layout_engine().set(rect=(0, bottom, 1, 1 - bottom))
+
+    ax1 = fig.add_subplot()
+    y = np.arange(len(values))
+    bars = ax1.barh(y, values, color='skyblue')
+    ax1.set_yticks(y)
+    ax1.set_yticklabels(labels)
+    ax1.set_xlabel("Cycle Count", fontproperties=LABEL_FP)
+    ax1.set_title(file_name.replace(".json", " — Cycle Tracker Breakdown"), fontproperties=TITLE_FP)
+    ax1.invert_yaxis()
+    ax1.grid(axis='x', linestyle='--', alpha=0.5)
+
+    ax1.bar_label(bars, labels=[f"{value:,}" for value in values], padding=3)
+    if values:
+        ax1.set_xlim(right=max(values) * 1.1)
+
+    fig.text(0.02, bottom - SUMMARY_PAD / fig_height, summary_text, fontsize=SUMMARY_FONTSIZE,
+             va='top', ha='left', linespacing=SUMMARY_LINESPACING, fontfamily='monospace')
+
+    fig.savefig(save_path, dpi=dpi, pil_kwargs=PNG_KWARGS)
+    if pdf:
+        fig.savefig(os.path.splitext(save_path)[0] + ".pdf")
+
+def process_file_star(job):
+    return process_file(*job)
+
+def is_up_to_date(output_path, file_path):
+    return os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(file_path)
 
 def main():
     # Parse directory containing benchmark JSON files
@@ -13,68 +134,62 @@ def main():
         default="testdata/benchmarks",
         help="Path to directory containing benchmark JSON files (default: testdata/benchmarks)"
     )
+    parser.add_argument(
+        "--out-subdir",
+        type=str,
+        default="charts",
+        help="Subdirectory of the input directory to write charts to (default: charts)"
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=TOP_K,
+        help=f"Number of cycle tracker entries to draw before grouping the rest as 'other', 0 draws all (default: {TOP_K})"
+    )
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=DPI,
+        help=f"Resolution of the generated PNG charts (default: {DPI})"
+    )
+    parser.add_argument(
+        "--pdf",
+        action="store_true",
+        help="Also save a vector PDF alongside each PNG chart"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate all charts, even if they are newer than their JSON files"
+    )
     args = parser.parse_args()
     input_dir = args.input_dir
 
-    json_files = [f for f in os.listdir(input_dir) if f.endswith(".json")]
+    with os.scandir(input_dir) as entries:
+        json_files = [e.name for e in entries if e.is_file() and e.name.endswith(".json")]
+
+    charts_dir = os.path.join(input_dir, args.out_subdir)
+    os.makedirs(charts_dir, exist_ok=True)
 
+    jobs = []
     for file_name in json_files:
         file_path = os.path.join(input_dir, file_name)
         save_name = os.path.splitext(file_name)[0] + ".png"
-
-        charts_dir = os.path.join(input_dir, "charts")
-        os.makedirs(charts_dir, exist_ok=True)
         save_path = os.path.join(charts_dir, save_name)
 
-        print(f"Processing: {file_path} → {save_path}")
+        # Skip charts that are already up to date with their JSON data
+        outputs = [save_path]
+        if args.pdf:
+            outputs.append(os.path.splitext(save_path)[0] + ".pdf")
+        if not args.force and all(is_up_to_date(path, file_path) for path in outputs):
+            print(f"Skipping: {file_path} (up to date)")
+            continue
 
-        with open(file_path) as f:
-            data = json.load(f)
+        jobs.append((file_path, save_path, args.top_k, args.dpi, args.pdf))
 
-        cycle_data = data["cycle_tracker_results"]
-        sorted_items = sorted(cycle_data.items(), key=lambda x: x[1], reverse=True)
-        labels = [label for label, _ in sorted_items]
-        values = [count for _, count in sorted_items]
-
-        # Dynamic summary construction
-        summary_lines = []
-        if "total_blobs" in data:
-            summary_lines.append(f"Total Blobs in Namespace: {data['total_blobs']:,}")
-        if "total_blockexec_inputs" in data:
-            summary_lines.append(f"Total EVM block executions: {data['total_blockexec_inputs']:,}")
-        if "total_tx_count" in data:
-            summary_lines.append(f"Total EVM Txs: {data['total_tx_count']:,}")
-        if "total_evm_gas" in data:
-            summary_lines.append(f"Total EVM Gas: {data['total_evm_gas']:,}")
-        if "total_proofs" in data:
-            summary_lines.append(f"Total Proofs: {data['total_proofs']:,}")
-
-        summary_lines.append(f"Total Gas: {data['total_gas']:,}")
-        summary_lines.append(f"Total Instructions: {data['total_instruction_count']:,}")
-        summary_lines.append(f"Total Syscalls: {data['total_syscall_count']:,}")
-        summary_text = "\n".join(summary_lines)
-
-        fig = plt.figure(figsize=(12, 7))
-        gs = GridSpec(2, 1, height_ratios=[4, 1], hspace=0.3)
-
-        ax1 = fig.add_subplot(gs[0])
-        bars = ax1.barh(labels, values, color='skyblue')
-        ax1.set_xlabel("Cycle Count")
-        ax1.set_title(file_name.replace(".json", " — Cycle Tracker Breakdown"))
-        ax1.invert_yaxis()
-        ax1.grid(axis='x', linestyle='--', alpha=0.5)
-
-        for bar, value in zip(bars, values):
-            ax1.text(value + max(values) * 0.01, bar.get_y() + bar.get_height() / 2,
-                     f"{value:,}", va='center')
-
-        ax2 = fig.add_subplot(gs[1])
-        ax2.axis('off')
-        ax2.text(0, 1, summary_text, fontsize=11, va='top', ha='left',
-                 linespacing=1.5, fontfamily='monospace')
-
-        plt.savefig(save_path, dpi=300, bbox_inches="tight")
-        plt.close(fig)
+    # Each chart is independent, so render them in parallel across all cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=worker_init) as executor:
+        list(executor.map(process_file_star, jobs, chunksize=1))
 
 if __name__ == "__main__":
     main()